@@ -1,69 +1,108 @@
+import asyncio
 import json
 import re
-from typing import Callable, List, Dict, Any
-from colorama import init, Fore, Style
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from ..common import (
+    Fore,
+    Style,
+    json_loads,
+    json_dumps,
+    is_tool_call,
+    build_converters,
+    build_validator,
+    extract_function_metadata,
+    get_function_metadata,
+)
 
-init(autoreset=True)
+_TOOL_CALL_RE = re.compile(r"<tool_call>(.*?)</tool_call>", re.DOTALL)
+_RESPONSE_RE = re.compile(r"<response>(.*?)</response>", re.DOTALL)
+_MAX_TOOL_WORKERS = 8
 
 class Tool:
-    def __init__(self, name: str, function: Callable, specification: str):
+    __slots__ = ("name", "function", "specification", "spec_dict", "converters", "validate")
+
+    def __init__(self, name: str, function: Callable, specification: str, spec_dict: Dict[str, Any] = None):
         self.name = name
         self.function = function
         self.specification = specification
+        self.spec_dict = spec_dict if spec_dict is not None else json.loads(specification)
+        self.converters = build_converters(self.spec_dict)
+        self.validate = build_validator(self.converters)
 
     def execute(self, **kwargs):
         return self.function(**kwargs)
 
-def extract_function_metadata(function: Callable) -> Dict[str, Any]:
-    metadata = {
-        "name": function.__name__,
-        "description": function.__doc__,
-        "parameters": {"properties": {}}
-    }
-    parameter_types = {
-        param_name: {"type": param_type.__name__}
-        for param_name, param_type in function.__annotations__.items()
-        if param_name != "return"
-    }
-    metadata["parameters"]["properties"] = parameter_types
-    return metadata
-
 def tool(function: Callable) -> Tool:
-    metadata = extract_function_metadata(function)
+    metadata, specification = get_function_metadata(function)
     return Tool(
         name=metadata.get("name"),
         function=function,
-        specification=json.dumps(metadata)
+        specification=specification,
+        spec_dict=metadata
     )
 
 class ReActAgent:
-    def __init__(self, llm: Callable, system_prompt: str, tools: List[Tool], max_iterations: int = 10):
+    def __init__(self, llm: Callable, system_prompt: str, tools: List[Tool], max_iterations: int = 10, debug: bool = False):
         self.llm = llm
         self.system_prompt = system_prompt
         self.tools = {tool.name: tool for tool in tools}
-        self.conversation_history = []
         self.max_iterations = max_iterations
+        self.debug = debug
+        self._tools_prompt = None
+        # Validators for tools that were not built by @tool, created on first use
+        self._validators = {}
+        self._system_message = {"role": "system", "content": system_prompt + "\n\n" + self.format_tools_for_prompt()}
+        # Single canonical message list sent to the model: system prompt first, then the conversation
+        self._messages = [self._system_message]
+
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        return self._messages[1:]
+
+    def _get_tool_spec(self, tool: Tool) -> Dict[str, Any]:
+        # @tool caches the parsed spec; other tools only need a JSON specification
+        tool_spec = getattr(tool, "spec_dict", None)
+        if tool_spec is None:
+            tool_spec = json_loads(tool.specification)
+        return tool_spec
+
+    def _get_validator(self, tool: Tool) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        validate = getattr(tool, "validate", None)
+        if validate is None:
+            validate = self._validators.get(tool.name)
+            if validate is None:
+                validate = self._validators[tool.name] = build_validator(build_converters(self._get_tool_spec(tool)))
+        return validate
 
     def format_tools_for_prompt(self) -> str:
-        tools_json = [json.loads(tool.specification) for tool in self.tools.values()]
-        return f"<tools>\n{json.dumps(tools_json, indent=2)}\n</tools>"
+        # Tool specs are fixed once decorated, so the block is rendered once per agent
+        if self._tools_prompt is None:
+            tools_json = [self._get_tool_spec(tool) for tool in self.tools.values()]
+            self._tools_prompt = f"<tools>\n{json_dumps(tools_json)}\n</tools>"
+        return self._tools_prompt
 
     def extract_tool_calls(self, response: str) -> List[Dict[str, Any]]:
         tool_calls = []
-        pattern = r"<tool_call>(.*?)</tool_call>"
-        matches = re.findall(pattern, response, re.DOTALL)
-        for match in matches:
+        # Plain substring search is far cheaper than a regex pass, and most
+        # responses carry no tags at all
+        if "<tool_call>" not in response:
+            return tool_calls
+        for match in _TOOL_CALL_RE.finditer(response):
+            payload = match.group(1)
             try:
-                tool_call = json.loads(match.strip())
-                if "name" in tool_call and "arguments" in tool_call:
+                tool_call = json_loads(payload.strip())
+                if is_tool_call(tool_call):
                     tool_calls.append(tool_call)
             except json.JSONDecodeError:
-                print(f"{Fore.RED}Failed to decode tool call: {match}{Style.RESET_ALL}")
+                print(f"{Fore.RED}Failed to decode tool call: {payload}{Style.RESET_ALL}")
                 continue
         return tool_calls
 
     def extract_final_response(self, response: str) -> str:
-        match = re.search(r"<response>(.*?)</response>", response, re.DOTALL)
+        if "<response>" not in response:
+            return None
+        match = _RESPONSE_RE.search(response)
         if match:
             return match.group(1).strip()
         return None
@@ -71,29 +110,7 @@ class ReActAgent:
     def convert_argument_types(self, tool_call: Dict[str, Any], tool_spec: Dict[str, Any]) -> Dict[str, Any]:
         if "parameters" not in tool_spec or "properties" not in tool_spec["parameters"]:
             return tool_call
-        properties = tool_spec["parameters"]["properties"]
-        type_mapping = {
-            "int": int,
-            "str": str,
-            "bool": bool,
-            "float": float,
-            "integer": int,
-            "string": str,
-            "boolean": bool,
-            "number": float
-        }
-        for arg_name, arg_value in tool_call["arguments"].items():
-            if arg_name in properties and "type" in properties[arg_name]:
-                expected_type = properties[arg_name]["type"]
-                if expected_type in type_mapping:
-                    converter = type_mapping[expected_type]
-                    try:
-                        if not isinstance(arg_value, converter):
-                            print(f"{Fore.BLUE}Converting argument '{arg_name}' from {type(arg_value).__name__} to {expected_type}{Style.RESET_ALL}")
-                            tool_call["arguments"][arg_name] = converter(arg_value)
-                    except (ValueError, TypeError) as e:
-                        print(f"{Fore.RED}Type conversion error for '{arg_name}': {str(e)}{Style.RESET_ALL}")
-                        pass
+        build_validator(build_converters(tool_spec))(tool_call["arguments"])
         return tool_call
 
     def execute_tool(self, tool_call: Dict[str, Any]) -> Any:
@@ -103,11 +120,10 @@ class ReActAgent:
             print(f"{Fore.RED}Error: Tool '{tool_name}' not found{Style.RESET_ALL}")
             return f"Error: Tool '{tool_name}' not found"
         tool = self.tools[tool_name]
-        print(f"{Fore.MAGENTA}Executing tool: {tool_name} with arguments: {json.dumps(arguments)}{Style.RESET_ALL}")
+        if self.debug:
+            print(f"{Fore.MAGENTA}Executing tool: {tool_name} with arguments: {arguments}{Style.RESET_ALL}")
         try:
-            tool_spec = json.loads(tool.specification)
-            validated_args = self.convert_argument_types({"arguments": arguments}, tool_spec)["arguments"]
-            arguments = validated_args
+            arguments = self._get_validator(tool)(arguments)
         except Exception as e:
             print(f"{Fore.RED}Error validating arguments: {str(e)}{Style.RESET_ALL}")
             pass
@@ -119,71 +135,139 @@ class ReActAgent:
             print(f"{Fore.RED}Error executing {tool_name}: {str(e)}{Style.RESET_ALL}")
             return f"Error executing {tool_name}: {str(e)}"
 
-    def run(self, user_input: str) -> str:
-        self.conversation_history.append({"role": "user", "content": user_input})
-        messages = [
-            {"role": "system", "content": self.system_prompt + "\n\n" + self.format_tools_for_prompt()}
-        ]
-        for message in self.conversation_history:
-            messages.append({"role": message["role"], "content": message["content"]})
+    def _parse_model_response(self, model_response: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        print(f"{Fore.YELLOW}Model response:\n{model_response}{Style.RESET_ALL}")
+
+        # Check for final response
+        final_response = self.extract_final_response(model_response)
+        if final_response is not None:
+            return final_response, []
+
+        # Extract tool calls from response
+        tool_calls = self.extract_tool_calls(model_response)
+        if not tool_calls:
+            print(f"{Fore.GREEN}No tool calls found. Returning model response.{Style.RESET_ALL}")
+            return model_response, []
+        return None, tool_calls
+
+    def _execute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[Any]:
+        # Calls from one turn are independent, so several of them run
+        # concurrently while each waits on its own I/O
+        print(f"{Fore.MAGENTA}{Style.BRIGHT}Executing {len(tool_calls)} tool call(s){Style.RESET_ALL}")
+        if len(tool_calls) == 1:
+            return [self.execute_tool(tool_calls[0])]
+        with ThreadPoolExecutor(max_workers=min(_MAX_TOOL_WORKERS, len(tool_calls))) as executor:
+            return list(executor.map(self.execute_tool, tool_calls))
 
-        iterations = 0
-        last_response = None
+    async def _aexecute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[Any]:
+        # Worker threads keep tools off the event loop, capped like the pool in _execute_tools
+        print(f"{Fore.MAGENTA}{Style.BRIGHT}Executing {len(tool_calls)} tool call(s){Style.RESET_ALL}")
+        semaphore = asyncio.Semaphore(_MAX_TOOL_WORKERS)
 
-        while iterations < self.max_iterations:
-            iterations += 1
-            print(f"{Fore.CYAN}{Style.BRIGHT}--- Iteration {iterations} ---{Style.RESET_ALL}")
+        async def run_one(tool_call: Dict[str, Any]) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(self.execute_tool, tool_call)
+
+        return list(await asyncio.gather(*(run_one(tool_call) for tool_call in tool_calls)))
+
+    def _format_tool_results(self, tool_calls: List[Dict[str, Any]], results: List[Any]) -> str:
+        parts = ["Tool results:"]
+        for tool_call, result in zip(tool_calls, results):
+            result_str = str(result)
+            if isinstance(result, (dict, list)):
+                try:
+                    result_str = json_dumps(result)
+                except Exception:
+                    pass
+            parts.append(f"- {tool_call.get('name')}{json_dumps(tool_call.get('arguments'))}: {result_str}")
+        results_text = "\n".join(parts) + "\n"
+
+        if self.debug:
+            print(f"{Fore.BLUE}Tool results to be sent to LLM:\n{results_text}{Style.RESET_ALL}")
+        return results_text
+
+    def _react_loop(self, messages: List[Dict[str, str]]) -> Tuple[str, Optional[str]]:
+        # Returns the answer and the model response to keep in the history (None if none was final)
+        for iteration in range(1, self.max_iterations + 1):
+            print(f"{Fore.CYAN}{Style.BRIGHT}--- Iteration {iteration} ---{Style.RESET_ALL}")
 
             # Get response from language model
             response = self.llm(model="gpt-4o", messages=messages)
             model_response = response.choices[0].message.content
-            print(f"{Fore.YELLOW}Model response:\n{model_response}{Style.RESET_ALL}")
-
-            # Check for final response
-            final_response = self.extract_final_response(model_response)
-            if final_response is not None:
-                # print(f"{Fore.GREEN}{Style.BRIGHT}Final response found!{Style.RESET_ALL}")
-                self.conversation_history.append({"role": "assistant", "content": model_response})
-                return final_response
-
-            # Extract tool calls from response
-            tool_calls = self.extract_tool_calls(model_response)
-            if not tool_calls:
-                print(f"{Fore.GREEN}No tool calls found. Returning model response.{Style.RESET_ALL}")
-                self.conversation_history.append({"role": "assistant", "content": model_response})
-                return model_response
-
-            # Execute tools and collect results
-            tool_results = []
-            for i, tool_call in enumerate(tool_calls):
-                print(f"{Fore.MAGENTA}{Style.BRIGHT}Executing tool call {i+1}/{len(tool_calls)}{Style.RESET_ALL}")
-                result = self.execute_tool(tool_call)
-                tool_results.append({
-                    "tool": tool_call.get("name"),
-                    "arguments": tool_call.get("arguments"),
-                    "result": result
-                })
-
-            # Format tool results for the next prompt
-            results_text = "Tool results:\n"
-            for res in tool_results:
-                result_str = str(res["result"])
-                if isinstance(res["result"], (dict, list)):
-                    try:
-                        result_str = json.dumps(res["result"], indent=2)
-                    except Exception:
-                        pass
-                results_text += f"- {res['tool']}{json.dumps(res['arguments'])}: {result_str}\n"
+            answer, tool_calls = self._parse_model_response(model_response)
+            if answer is not None:
+                return answer, model_response
 
-            print(f"{Fore.BLUE}Tool results to be sent to LLM:\n{results_text}{Style.RESET_ALL}")
+            results_text = self._format_tool_results(tool_calls, self._execute_tools(tool_calls))
 
             # Add model response and tool results to messages for next iteration
             messages.append({"role": "assistant", "content": model_response})
             messages.append({"role": "user", "content": results_text})
 
         print(f"{Fore.RED}Max iterations reached without a final response.{Style.RESET_ALL}")
-        return "Max iterations reached without a final response."
+        return "Max iterations reached without a final response.", None
+
+    async def _areact_loop(self, messages: List[Dict[str, str]]) -> Tuple[str, Optional[str]]:
+        # Same loop as _react_loop for an async llm; tools run in worker threads
+        # so they never block the event loop
+        for iteration in range(1, self.max_iterations + 1):
+            print(f"{Fore.CYAN}{Style.BRIGHT}--- Iteration {iteration} ---{Style.RESET_ALL}")
+
+            response = await self.llm(model="gpt-4o", messages=messages)
+            model_response = response.choices[0].message.content
+            answer, tool_calls = self._parse_model_response(model_response)
+            if answer is not None:
+                return answer, model_response
+
+            results_text = self._format_tool_results(tool_calls, await self._aexecute_tools(tool_calls))
+
+            messages.append({"role": "assistant", "content": model_response})
+            messages.append({"role": "user", "content": results_text})
+
+        print(f"{Fore.RED}Max iterations reached without a final response.{Style.RESET_ALL}")
+        return "Max iterations reached without a final response.", None
+
+    def _end_turn(self, turn_start: int, model_response: Optional[str]):
+        # Tool calls and observations only live for the duration of a run
+        del self._messages[turn_start:]
+        if model_response is not None:
+            self._messages.append({"role": "assistant", "content": model_response})
+
+    def run(self, user_input: str) -> str:
+        self._messages.append({"role": "user", "content": user_input})
+        turn_start = len(self._messages)
+        model_response = None
+        try:
+            answer, model_response = self._react_loop(self._messages)
+            return answer
+        finally:
+            self._end_turn(turn_start, model_response)
+
+    async def arun(self, user_input: str) -> str:
+        # For an async llm such as AsyncOpenAI().chat.completions.create, which
+        # reuses one pooled connection across every iteration of the loop
+        self._messages.append({"role": "user", "content": user_input})
+        turn_start = len(self._messages)
+        model_response = None
+        try:
+            answer, model_response = await self._areact_loop(self._messages)
+            return answer
+        finally:
+            self._end_turn(turn_start, model_response)
+
+    async def run_batch_async(self, prompts: List[str], concurrency: int = 8) -> List[str]:
+        # Independent prompts overlap their LLM round trips; each one runs on its own
+        # message list and leaves the agent's conversation history untouched
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(prompt: str) -> str:
+            async with semaphore:
+                messages = [self._system_message, {"role": "user", "content": prompt}]
+                answer, _ = await self._areact_loop(messages)
+                return answer
+
+        return list(await asyncio.gather(*(run_one(prompt) for prompt in prompts)))
 
     def reset_conversation(self):
         print(f"{Fore.GREEN}Conversation history reset{Style.RESET_ALL}")
-        self.conversation_history = []
\ No newline at end of file
+        del self._messages[1:]
\ No newline at end of file
@@ -0,0 +1,18 @@
+from .console import Fore, Style
+from .json_utils import COMPACT_SEPARATORS, json_loads, json_dumps, is_tool_call
+from .validation import TYPE_MAP, build_converters, build_validator
+from .metadata import extract_function_metadata, get_function_metadata
+
+__all__ = [
+    "Fore",
+    "Style",
+    "COMPACT_SEPARATORS",
+    "json_loads",
+    "json_dumps",
+    "is_tool_call",
+    "TYPE_MAP",
+    "build_converters",
+    "build_validator",
+    "extract_function_metadata",
+    "get_function_metadata",
+]
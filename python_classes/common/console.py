@@ -0,0 +1,14 @@
+import sys
+
+# Initialize colorama only when writing to a terminal; sys.stdout is None under pythonw
+# and some embedded hosts, which counts as not a terminal
+if getattr(sys.stdout, "isatty", lambda: False)():
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+else:
+    # Piped or captured output: colour codes collapse to empty strings and stdout stays unwrapped
+    class _NoColor:
+        def __getattr__(self, name):
+            return ""
+
+    Fore = Style = _NoColor()
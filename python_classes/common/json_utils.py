@@ -0,0 +1,37 @@
+import json
+import re
+from typing import Any
+
+# Prompt text is read by the LLM, not a human, so skip pretty-printing whitespace
+COMPACT_SEPARATORS = (",", ":")
+
+# orjson is optional. The stdlib fallback matches its compact separators and raw UTF-8,
+# but floats can still render differently (1e+16 vs 1e16), so prompt bytes may differ
+try:
+    import orjson
+
+    # orjson decodes integers beyond 64 bits as floats and silently drops precision;
+    # any run of 19+ digits might be one, so such payloads take the exact stdlib path
+    _LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+    def json_loads(data: str) -> Any:
+        if _LONG_DIGITS_RE.search(data):
+            return json.loads(data)
+        return orjson.loads(data)
+
+    def json_dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson refuses integers wider than 64 bits, which the stdlib encodes exactly
+            return json.dumps(obj, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+except ImportError:
+    def json_loads(data: str) -> Any:
+        return json.loads(data)
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+
+def is_tool_call(obj: Any) -> bool:
+    # A decoded tool call must be an object with a string name and an object of arguments
+    return isinstance(obj, dict) and isinstance(obj.get("name"), str) and isinstance(obj.get("arguments"), dict)
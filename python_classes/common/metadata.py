@@ -0,0 +1,56 @@
+import json
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+def extract_function_metadata(function: Callable) -> Dict[str, Any]:
+    """
+    Creates a metadata dictionary from a function's signature.
+    
+    Parameters:
+        function: The target function to analyze
+        
+    Returns:
+        A dictionary containing the function's name, documentation, and parameter specifications
+    """
+    # Initialize the basic structure
+    metadata = {
+        "name": function.__name__,
+        "description": function.__doc__,
+        "parameters": {"properties": {}}
+    }
+    
+    # Extract parameter types (excluding return annotation)
+    parameter_types = {
+        param_name: {"type": param_type.__name__}
+        for param_name, param_type in function.__annotations__.items()
+        if param_name != "return"
+    }
+    
+    # Add parameters to metadata
+    metadata["parameters"]["properties"] = parameter_types
+    return metadata
+
+# Introspection results per decorated function; weak keys let unused functions be collected
+_metadata_cache = weakref.WeakKeyDictionary()
+
+def get_function_metadata(function: Callable) -> Tuple[Dict[str, Any], str]:
+    """
+    Returns a function's metadata and its JSON specification, introspecting it only once.
+    
+    Parameters:
+        function: The target function to analyze
+        
+    Returns:
+        A tuple of the metadata dictionary and its JSON-encoded specification
+    """
+    try:
+        cached = _metadata_cache.get(function)
+    except TypeError:
+        # Callables that cannot be weakly referenced are introspected every time
+        metadata = extract_function_metadata(function)
+        return metadata, json.dumps(metadata)
+        
+    if cached is None:
+        metadata = extract_function_metadata(function)
+        cached = _metadata_cache[function] = (metadata, json.dumps(metadata))
+    return cached
@@ -0,0 +1,63 @@
+from typing import Any, Callable, Dict
+from .console import Fore, Style
+
+# Type conversion mapping shared by every tool and agent
+TYPE_MAP = {
+    "int": int,
+    "str": str,
+    "bool": bool,
+    "float": float,
+    "integer": int,
+    "string": str,
+    "boolean": bool,
+    "number": float
+}
+
+def build_converters(function_spec: Dict[str, Any]) -> Dict[str, type]:
+    """
+    Resolves the converter for every typed parameter of a function specification once.
+    
+    Parameters:
+        function_spec: Dictionary containing the expected parameter types
+        
+    Returns:
+        A dictionary mapping each parameter name to the type its argument must have
+    """
+    properties = function_spec.get("parameters", {}).get("properties", {})
+    return {
+        param_name: TYPE_MAP[param["type"]]
+        for param_name, param in properties.items()
+        if param.get("type") in TYPE_MAP
+    }
+
+def build_validator(converters: Dict[str, type]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Specializes argument conversion for one tool's fixed parameter schema.
+    
+    Parameters:
+        converters: Mapping of parameter names to the type each argument must have
+        
+    Returns:
+        A function that converts an arguments dictionary in place and returns it;
+        an argument that cannot be converted keeps its original value
+    """
+    # Only the typed parameters are visited, with no spec or type-name lookups per call
+    checks = tuple(converters.items())
+    
+    def validate(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        for param_name, converter in checks:
+            if param_name not in arguments:
+                continue
+            value = arguments[param_name]
+            # Exact type check: isinstance(True, int) holds, so bools would slip past int parameters
+            if type(value) is converter:
+                continue
+            try:
+                print(f"{Fore.BLUE}Converting argument '{param_name}' from {type(value).__name__} to {converter.__name__}{Style.RESET_ALL}")
+                arguments[param_name] = converter(value)
+            except (ValueError, TypeError) as e:
+                # Keep the original value and carry on with the remaining arguments
+                print(f"{Fore.RED}Type conversion error for '{param_name}': {str(e)}{Style.RESET_ALL}")
+        return arguments
+        
+    return validate
@@ -0,0 +1,3 @@
+from .fragments import TOOL_CALL_FORMAT, TOOL_CALL_EXAMPLE
+
+__all__ = ["TOOL_CALL_FORMAT", "TOOL_CALL_EXAMPLE"]
\ No newline at end of file
@@ -0,0 +1,12 @@
+# Prompt text shared by the agent system prompts. Keeping a single copy means every
+# agent sends byte-identical instructions, which a provider's prefix cache can reuse.
+
+TOOL_CALL_FORMAT = """<tool_call>
+{"name": "function_name", "arguments": {"param1": "value1", "param2": "value2"}}
+</tool_call>"""
+
+TOOL_CALL_EXAMPLE = """For example, for a tool `add_two_numbers` whose parameters `a` and `b` are both of type int, your tool call should look like:
+
+<tool_call>
+{"name": "add_two_numbers", "arguments": {"a": 1, "b": 2}}
+</tool_call>"""
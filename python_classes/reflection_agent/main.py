@@ -1,9 +1,16 @@
 import os
-from openai import OpenAI
+import copy
+import asyncio
+import importlib.util
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
-from colorama import Fore
 from rich.markdown import Markdown
 from rich.console import Console
+from ..common import Fore
+
+# HTTP/2 needs the optional h2 package; without it the pool stays on keep-alive HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class ReflectionAgent:
@@ -21,7 +28,14 @@ class ReflectionAgent:
         """
         load_dotenv()
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.client = OpenAI(api_key=self.api_key)
+        # One pooled connection is reused by every generate/reflect/improve call
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=DefaultAsyncHttpxClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=20),
+            ),
+        )
         self.model = model
         self.generator_prompts = list(generator_prompts)
         self.reflection_prompts = list(reflection_prompts)
@@ -30,33 +44,33 @@ class ReflectionAgent:
         self.improved_code = None
         self.num_steps = num_steps
 
-    def generate_code(self, user_prompt):
+    async def generate_code(self, user_prompt):
         self.generator_prompts.append({"role": "user", "content": user_prompt})
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=self.generator_prompts,
         )
         self.generated_code = response.choices[0].message.content
         return self.generated_code
 
-    def reflect_on_code(self):
+    async def reflect_on_code(self):
         self.reflection_prompts.append({
             "role": "user",
             "content": f"Here is the code generated by the generator block: {self.generated_code}"
         })
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=self.reflection_prompts,
         )
         self.reflection_feedback = response.choices[0].message.content
         return self.reflection_feedback
 
-    def improve_code(self):
+    async def improve_code(self):
         self.generator_prompts.append({
             "role": "user",
             "content": f"Here is the feedback from the reflection block: {self.reflection_feedback}"
         })
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=self.generator_prompts,
         )
@@ -67,7 +81,7 @@ class ReflectionAgent:
         console = Console()
         console.print(Markdown(content))
 
-    def run(self, user_prompt, display_steps=True):
+    async def run(self, user_prompt, display_steps=True):
         """
         Runs the agent for a specified number of improvement steps.
 
@@ -76,19 +90,50 @@ class ReflectionAgent:
             display_steps (bool): Whether to display each step.
             num_steps (int): Number of improvement iterations to perform.
         """
-        code = self.generate_code(user_prompt)
+        code = await self.generate_code(user_prompt)
         if display_steps:
             print(Fore.CYAN + "Generated Code:")
             print(Fore.RESET + code)
         for step in range(self.num_steps):
-            feedback = self.reflect_on_code()
+            feedback = await self.reflect_on_code()
             if display_steps:
                 print(Fore.YELLOW + f"Reflection Feedback (Step {step+1}):")
                 print(Fore.RESET + feedback)
-            improved = self.improve_code()
+            improved = await self.improve_code()
             if display_steps:
                 print(Fore.GREEN + f"Improved Code (Step {step+1}):")
                 print(Fore.RESET + improved)
             # Prepare for next iteration
             self.generated_code = self.improved_code
         return self.improved_code
+
+    def _fork(self):
+        """
+        Returns a copy that shares the API client but owns its prompt histories,
+        so concurrent runs never append to each other's conversations.
+        """
+        agent = copy.copy(self)
+        agent.generator_prompts = list(self.generator_prompts)
+        agent.reflection_prompts = list(self.reflection_prompts)
+        agent.generated_code = None
+        agent.reflection_feedback = None
+        agent.improved_code = None
+        return agent
+
+    async def run_many(self, user_prompts, display_steps=False):
+        """
+        Runs the agent on several prompts concurrently.
+
+        Every model call is network-bound, so the prompts overlap their
+        request latency instead of waiting on one another.
+
+        Args:
+            user_prompts (list[str]): The prompts to run independently.
+            display_steps (bool): Whether to display each step.
+
+        Returns:
+            list[str]: The improved code for each prompt, in input order.
+        """
+        return await asyncio.gather(
+            *(self._fork().run(prompt, display_steps) for prompt in user_prompts)
+        )
@@ -1,10 +1,13 @@
 import json
 import re
-from typing import List, Dict, Any, Callable
-from colorama import init, Fore, Style
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from ..common import Fore, Style, json_loads, json_dumps, is_tool_call, build_converters, build_validator
 
-# Initialize colorama
-init(autoreset=True)
+# Compiled once so every LLM turn skips the re module's pattern cache lookup
+_TOOL_CALL_RE = re.compile(r"<tool_call>(.*?)</tool_call>", re.DOTALL)
+# Upper bound on tool calls from a single response that run at the same time
+_MAX_TOOL_WORKERS = 8
 
 class ToolCallingAgent:
     """
@@ -14,7 +17,7 @@ class ToolCallingAgent:
     allowing the model to decide when to call functions and processing the results.
     """
     
-    def __init__(self, llm: Callable, system_prompt: str, tools: List[Any]):
+    def __init__(self, llm: Callable, system_prompt: str, tools: List[Any], debug: bool = False):
         """
         Initialize an AI agent with a language model and tools.
         
@@ -22,20 +25,59 @@ class ToolCallingAgent:
             llm: Function that takes a prompt string and returns a response
             system_prompt: Instructions for guiding the language model's behavior
             tools: List of Tool objects that the agent can use
+            debug: Whether to echo tool arguments on every tool invocation
         """
         self.model = llm
         self.system_prompt = system_prompt
+        self.debug = debug
         self.tools = {tool.name: tool for tool in tools}
-        self.conversation_history = []
+        # How each tool is called never changes, so the interface is resolved once per tool
+        self._invokers = {name: self._resolve_caller(tool) for name, tool in self.tools.items()}
+        self._tools_prompt = None
+        self._system_message = {"role": "system", "content": system_prompt + "\n\n" + self.format_tools_for_prompt()}
+        # Messages sent to the model: the system prompt followed by the conversation so far
+        self._messages = [self._system_message]
         print(f"{Fore.GREEN}ToolCallingAgent initialized with {len(tools)} tools{Style.RESET_ALL}")
         
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """The user and assistant turns exchanged so far, without the system prompt."""
+        return self._messages[1:]
+        
+    def _resolve_caller(self, tool: Any) -> Optional[Tuple[str, Callable]]:
+        """Pick the callable used to run a tool, returning a label for logging and the callable."""
+        # First try the execute method for tools created with the @tool decorator
+        if hasattr(tool, "execute"):
+            return "tool.execute() method", tool.execute
+        # Then try the function attribute which is used by the @tool decorator
+        elif hasattr(tool, "function"):
+            return "tool.function() method", tool.function
+        # Fall back to run method
+        elif hasattr(tool, "run"):
+            return "tool.run() method", tool.run
+        # Last resort: call the tool directly if it's callable
+        elif callable(tool):
+            return "tool directly", tool
+        return None
+        
+    def _get_tool_spec(self, tool: Any) -> Dict[str, Any]:
+        """Return the parsed specification of a tool, reusing the dict cached by @tool."""
+        tool_spec = getattr(tool, "spec_dict", None)
+        if tool_spec is None:
+            tool_spec = json_loads(tool.specification)
+        return tool_spec
+        
     def format_tools_for_prompt(self) -> str:
         """Format all available tools into a format the language model can understand."""
+        # The tool set is fixed at construction, so the prompt block is built only once
+        if self._tools_prompt is not None:
+            return self._tools_prompt
+            
         tools_json = []
         for tool in self.tools.values():
             try:
                 # Use the specification provided by the @tool decorator
-                tools_json.append(json.loads(tool.specification))
+                tools_json.append(self._get_tool_spec(tool))
             except (json.JSONDecodeError, AttributeError):
                 # Fallback for tools without proper specification
                 tools_json.append({
@@ -45,7 +87,8 @@ class ToolCallingAgent:
                 })
         
         print(f"{Fore.CYAN}Formatted {len(tools_json)} tools for LLM prompt{Style.RESET_ALL}")
-        return f"<tools>\n{json.dumps(tools_json, indent=2)}\n</tools>"
+        self._tools_prompt = f"<tools>\n{json_dumps(tools_json)}\n</tools>"
+        return self._tools_prompt
     
     def extract_tool_calls(self, response: str) -> List[Dict[str, Any]]:
         """
@@ -58,13 +101,13 @@ class ToolCallingAgent:
             A list of tool call dictionaries with 'name' and 'arguments' keys
         """
         tool_calls = []
-        pattern = r"<tool_call>(.*?)</tool_call>"
-        matches = re.findall(pattern, response, re.DOTALL)
+        # Skip the regex pass entirely when the literal tag is absent
+        matches = _TOOL_CALL_RE.finditer(response) if "<tool_call>" in response else ()
         
         for match in matches:
             try:
-                tool_call = json.loads(match.strip())
-                if "name" in tool_call and "arguments" in tool_call:
+                tool_call = json_loads(match.group(1).strip())
+                if is_tool_call(tool_call):
                     tool_calls.append(tool_call)
             except json.JSONDecodeError:
                 continue
@@ -94,44 +137,33 @@ class ToolCallingAgent:
             return f"Error: Tool '{tool_name}' not found"
             
         tool = self.tools[tool_name]
-        print(f"{Fore.MAGENTA}Executing tool: {tool_name} with arguments: {json.dumps(arguments)}{Style.RESET_ALL}")
+        if self.debug:
+            print(f"{Fore.MAGENTA}Executing tool: {tool_name} with arguments: {arguments}{Style.RESET_ALL}")
         
         # Validate and convert argument types using the tool's specification
         try:
-            if hasattr(tool, "specification"):
-                tool_spec = json.loads(tool.specification)
-                validated_args = self.convert_argument_types(
-                    {"arguments": arguments}, 
-                    tool_spec
-                )["arguments"]
-                arguments = validated_args
+            # @tool builds a validator once; other tools fall back to their specification
+            validate = getattr(tool, "validate", None)
+            if validate is None and hasattr(tool, "specification"):
+                validate = build_validator(build_converters(self._get_tool_spec(tool)))
+            if validate is not None:
+                arguments = validate(arguments)
                 print(f"{Fore.BLUE}Arguments validated and converted to appropriate types{Style.RESET_ALL}")
-        except (json.JSONDecodeError, AttributeError, KeyError) as e:
+        except (json.JSONDecodeError, AttributeError, KeyError, ValueError, TypeError) as e:
             print(f"{Fore.RED}Error validating arguments: {str(e)}{Style.RESET_ALL}")
             # Continue with original arguments if validation fails
             pass
             
+        # Handle execution based on the tool interface resolved at construction
+        invoker = self._invokers[tool_name]
+        if invoker is None:
+            print(f"{Fore.RED}Error: Tool '{tool_name}' is not callable{Style.RESET_ALL}")
+            return f"Error: Tool '{tool_name}' is not callable"
+            
+        label, invoke = invoker
         try:
-            # Handle execution based on the tool interface
-            # First try the execute method for tools created with the @tool decorator
-            if hasattr(tool, "execute"):
-                print(f"{Fore.GREEN}Calling tool.execute() method{Style.RESET_ALL}")
-                return tool.execute(**arguments)
-            # Then try the function attribute which is used by the @tool decorator
-            elif hasattr(tool, "function"):
-                print(f"{Fore.GREEN}Calling tool.function() method{Style.RESET_ALL}")
-                return tool.function(**arguments)
-            # Fall back to run method
-            elif hasattr(tool, "run"):
-                print(f"{Fore.GREEN}Calling tool.run() method{Style.RESET_ALL}")
-                return tool.run(**arguments)
-            # Last resort: call the tool directly if it's callable
-            elif callable(tool):
-                print(f"{Fore.GREEN}Calling tool directly{Style.RESET_ALL}")
-                return tool(**arguments)
-            else:
-                print(f"{Fore.RED}Error: Tool '{tool_name}' is not callable{Style.RESET_ALL}")
-                return f"Error: Tool '{tool_name}' is not callable"
+            print(f"{Fore.GREEN}Calling {label}{Style.RESET_ALL}")
+            return invoke(**arguments)
         except Exception as e:
             print(f"{Fore.RED}Error executing {tool_name}: {str(e)}{Style.RESET_ALL}")
             return f"Error executing {tool_name}: {str(e)}"
@@ -150,51 +182,34 @@ class ToolCallingAgent:
         if "parameters" not in tool_spec or "properties" not in tool_spec["parameters"]:
             return tool_call
             
-        properties = tool_spec["parameters"]["properties"]
+        build_validator(build_converters(tool_spec))(tool_call["arguments"])
+        return tool_call
+    
+    def _execute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Execute every tool call from one model response.
         
-        # Standard type converters
-        type_mapping = {
-            "int": int,
-            "str": str,
-            "bool": bool,
-            "float": float,
-            "integer": int,
-            "string": str,
-            "boolean": bool,
-            "number": float
-        }
+        Arguments are JSON literals, so no call can depend on another call's output;
+        when there are several they run concurrently on a thread pool.
         
-        for arg_name, arg_value in tool_call["arguments"].items():
-            if arg_name in properties and "type" in properties[arg_name]:
-                expected_type = properties[arg_name]["type"]
-                
-                if expected_type in type_mapping:
-                    converter = type_mapping[expected_type]
-                    try:
-                        # Only convert if types don't match
-                        if not isinstance(arg_value, converter):
-                            print(f"{Fore.BLUE}Converting argument '{arg_name}' from {type(arg_value).__name__} to {expected_type}{Style.RESET_ALL}")
-                            tool_call["arguments"][arg_name] = converter(arg_value)
-                    except (ValueError, TypeError) as e:
-                        print(f"{Fore.RED}Type conversion error for '{arg_name}': {str(e)}{Style.RESET_ALL}")
-                        # Keep original value if conversion fails
-                        pass
-                        
-        return tool_call
+        Args:
+            tool_calls: Tool call dictionaries extracted from the model response
+            
+        Returns:
+            The result of each tool call, in the same order as the calls
+        """
+        print(f"{Fore.MAGENTA}{Style.BRIGHT}Executing {len(tool_calls)} tool call(s){Style.RESET_ALL}")
+        if len(tool_calls) == 1:
+            return [self.execute_tool(tool_calls[0])]
+        with ThreadPoolExecutor(max_workers=min(_MAX_TOOL_WORKERS, len(tool_calls))) as executor:
+            return list(executor.map(self.execute_tool, tool_calls))
     
     def run(self, user_input: str) -> str:
         print(f"{Fore.WHITE}{Style.BRIGHT}=== Starting agent run with user input: '{user_input}' ==={Style.RESET_ALL}")
-        # Add user input to conversation history
-        self.conversation_history.append({"role": "user", "content": user_input})
-
-        # Build the messages list for OpenAI API
-        messages = [
-            {"role": "system", "content": self.system_prompt + "\n\n" + self.format_tools_for_prompt()}
-        ]
-        
-        # Add conversation history
-        for message in self.conversation_history:
-            messages.append({"role": message["role"], "content": message["content"]})
+        # Add user input to the conversation, which is also the messages list for the OpenAI API
+        messages = self._messages
+        messages.append({"role": "user", "content": user_input})
+        turn_start = len(messages)
 
         # Get response from language model
         print(f"{Fore.CYAN}Calling language model...{Style.RESET_ALL}")
@@ -212,9 +227,7 @@ class ToolCallingAgent:
         else:
             # Execute tools and collect results
             tool_results = []
-            for i, tool_call in enumerate(tool_calls):
-                print(f"{Fore.MAGENTA}{Style.BRIGHT}Executing tool call {i+1}/{len(tool_calls)}{Style.RESET_ALL}")
-                result = self.execute_tool(tool_call)
+            for tool_call, result in zip(tool_calls, self._execute_tools(tool_calls)):
                 tool_results.append({
                     "tool": tool_call.get("name"),
                     "arguments": tool_call.get("arguments"),
@@ -222,16 +235,17 @@ class ToolCallingAgent:
                 })
             
             # Format tool results
-            results_text = "Tool results:\n"
+            parts = ["Tool results:"]
             for res in tool_results:
                 result_str = str(res["result"])
                 if isinstance(res["result"], (dict, list)):
                     try:
-                        result_str = json.dumps(res["result"], indent=2)
+                        result_str = json_dumps(res["result"])
                     except:
                         pass
                     
-                results_text += f"- {res['tool']}{json.dumps(res['arguments'])}: {result_str}\n"
+                parts.append(f"- {res['tool']}{json_dumps(res['arguments'])}: {result_str}")
+            results_text = "\n".join(parts) + "\n"
             
             print(f"{Fore.BLUE}Formatted tool results{Style.RESET_ALL}")
             
@@ -241,12 +255,16 @@ class ToolCallingAgent:
             
             # Get final response from language model with tool results
             print(f"{Fore.CYAN}Calling language model with tool results...{Style.RESET_ALL}")
-            final_response_obj = self.model(model="gpt-4o", messages=messages)
+            try:
+                final_response_obj = self.model(model="gpt-4o", messages=messages)
+            finally:
+                # The tool round-trip is scratch work; only the final answer stays in the history
+                del messages[turn_start:]
             final_response = final_response_obj.choices[0].message.content
             print(f"{Fore.CYAN}Received final response from language model ({len(final_response)} chars){Style.RESET_ALL}")
         
         # Add final response to conversation history
-        self.conversation_history.append({
+        messages.append({
             "role": "assistant", 
             "content": final_response
         })
@@ -257,4 +275,4 @@ class ToolCallingAgent:
     def reset_conversation(self):
         """Clear the conversation history."""
         print(f"{Fore.GREEN}Conversation history reset{Style.RESET_ALL}")
-        self.conversation_history = []
\ No newline at end of file
+        del self._messages[1:]
\ No newline at end of file
@@ -1,33 +1,6 @@
 from typing import Callable, Dict, Any
 import json
-
-def extract_function_metadata(function: Callable) -> Dict[str, Any]:
-    """
-    Creates a metadata dictionary from a function's signature.
-    
-    Parameters:
-        function: The target function to analyze
-        
-    Returns:
-        A dictionary containing the function's name, documentation, and parameter specifications
-    """
-    # Initialize the basic structure
-    metadata = {
-        "name": function.__name__,
-        "description": function.__doc__,
-        "parameters": {"properties": {}}
-    }
-    
-    # Extract parameter types (excluding return annotation)
-    parameter_types = {
-        param_name: {"type": param_type.__name__}
-        for param_name, param_type in function.__annotations__.items()
-        if param_name != "return"
-    }
-    
-    # Add parameters to metadata
-    metadata["parameters"]["properties"] = parameter_types
-    return metadata
+from ..common import TYPE_MAP, build_converters, build_validator, extract_function_metadata, get_function_metadata
 
 def convert_argument_types(tool_invocation: Dict[str, Any], function_spec: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -42,19 +15,11 @@ def convert_argument_types(tool_invocation: Dict[str, Any], function_spec: Dict[
     """
     expected_params = function_spec["parameters"]["properties"]
     
-    # Type conversion mapping
-    type_converters = {
-        "int": int,
-        "str": str,
-        "bool": bool,
-        "float": float
-    }
-    
     # Convert each argument to its expected type if needed
     for arg_name, arg_value in tool_invocation["arguments"].items():
         target_type = expected_params[arg_name].get("type")
-        if not isinstance(arg_value, type_converters[target_type]):
-            tool_invocation["arguments"][arg_name] = type_converters[target_type](arg_value)
+        if type(arg_value) is not TYPE_MAP[target_type]:
+            tool_invocation["arguments"][arg_name] = TYPE_MAP[target_type](arg_value)
             
     return tool_invocation
 
@@ -66,11 +31,20 @@ class Tool:
         name: Tool identifier
         function: The underlying function
         specification: JSON-formatted function metadata
+        spec_dict: The parsed specification, so agents never re-parse the JSON
+        converters: Parameter name to type converter, resolved at decoration time
+        validate: Argument converter specialized for this tool's parameters
     """
-    def __init__(self, name: str, function: Callable, specification: str):
+    # Fixed attribute set: no per-instance __dict__, and slot descriptors for attribute access
+    __slots__ = ("name", "function", "specification", "spec_dict", "converters", "validate")
+    
+    def __init__(self, name: str, function: Callable, specification: str, spec_dict: Dict[str, Any] = None):
         self.name = name
         self.function = function
         self.specification = specification
+        self.spec_dict = spec_dict if spec_dict is not None else json.loads(specification)
+        self.converters = build_converters(self.spec_dict)
+        self.validate = build_validator(self.converters)
         
     def __str__(self):
         return self.specification
@@ -98,11 +72,12 @@ def tool(function: Callable) -> Tool:
         A fully configured Tool object
     """
     def create_tool():
-        metadata = extract_function_metadata(function)
+        metadata, specification = get_function_metadata(function)
         return Tool(
             name=metadata.get("name"),
             function=function,
-            specification=json.dumps(metadata)
+            specification=specification,
+            spec_dict=metadata
         )
     
     return create_tool()
\ No newline at end of file
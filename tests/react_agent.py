@@ -1,17 +1,30 @@
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+import hashlib
+import shelve
+from functools import lru_cache
+from types import SimpleNamespace
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
 from python_classes.ReAct_agent import ReActAgent
 from python_classes.tool_calling_agent import tool
+from python_classes.prompts import TOOL_CALL_FORMAT, TOOL_CALL_EXAMPLE
 from dotenv import load_dotenv
 import json
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-REACT_SYSTEM_PROMPT = """
+# The system prompt is composed of independent modules so a prefix cache can reuse
+# the static preamble even when the tool set (and so the tools block) changes
+REACT_PREAMBLE = """
 # ReAct Agent: Reasoning and Acting Framework
 
 You are an AI assistant that follows the ReAct (Reasoning and Acting) framework to solve problems. Your thinking process is structured in a clear cycle: Thought → Action → Observation.
@@ -26,42 +39,16 @@ You are an AI assistant that follows the ReAct (Reasoning and Acting) framework
 
 You have access to the following functions to help users:
 
-<tools>
-__TOOLS__
-</tools>
+"""
 
+REACT_RULES = """
 ## Tool Calling Format
 
 When you decide to use a tool, format your call exactly as follows:
 
-<tool_call>
-{"name": "function_name", "arguments": {"param1": "value1", "param2": "value2"}}
-</tool_call>
-
-For example, if you have a tool with this definition:
-
-<tool_call>
-{
-    "name": "add_two_numbers",
-    "description": "Used to add two numbers together",
-    "parameters": {
-        "properties": {
-            "a": {
-                "type": "int"
-            },
-            "b": {
-                "type": "int"
-            }
-        }
-    }
-}
-</tool_call>
-
-Your tool call should look like:
-
-<tool_call>
-{"name": "add_two_numbers", "arguments": {"a": 1, "b": 2}}
-</tool_call>
+""" + TOOL_CALL_FORMAT + """
+
+""" + TOOL_CALL_EXAMPLE + """
 
 ## Interaction Flow
 
@@ -117,21 +104,97 @@ def calculate_area_of_rectangle(length: float, width: float) -> float:
 
 tools = [add_two_numbers, calculate_area_of_rectangle]
 
-# Prepare your system prompt (replace __TOOLS__ as in your notebook)
-tools_json = json.dumps([json.loads(t.specification) for t in tools], indent=2)
-REACT_SYSTEM_PROMPT = REACT_SYSTEM_PROMPT.replace("__TOOLS__", tools_json)
-
-# Create OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-# Create the agent
-agent = ReActAgent(
-    llm=client.chat.completions.create,
-    system_prompt=REACT_SYSTEM_PROMPT,
-    tools=tools
-)
-
-# Run the agent
-result = agent.run("""The sum of 10 and 20 is the width of a rectangle that 
-                   is 100 units long. What is the area of the rectangle?""")
-print(result)
+@lru_cache(maxsize=1)
+def build_system_prompt():
+    # Prepare your system prompt from its modules. Built on first use rather than at import,
+    # so a DEBUG set in .env is seen once load_dotenv() has run.
+    # Compact JSON costs fewer prompt tokens on every call; set DEBUG=1 to pretty-print it.
+    # The stdlib path keeps non-ASCII text raw like orjson, but floats may still render
+    # differently, so the prompt bytes are only stable for a given JSON backend
+    tool_specs = [t.spec_dict for t in tools]
+    if orjson is not None:
+        tools_json = orjson.dumps(tool_specs, option=orjson.OPT_INDENT_2 if os.getenv("DEBUG") else 0).decode()
+    elif os.getenv("DEBUG"):
+        tools_json = json.dumps(tool_specs, indent=2, ensure_ascii=False)
+    else:
+        tools_json = json.dumps(tool_specs, separators=(",", ":"), ensure_ascii=False)
+    tools_block = f"<tools>\n{tools_json}\n</tools>\n"
+    return REACT_PREAMBLE + tools_block + REACT_RULES
+
+@lru_cache(maxsize=1)
+def get_client():
+    # Built on first use, so importing this module reads no .env and opens no TLS context;
+    # later agents reuse the same client and its connection pool
+    load_dotenv()
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Identical requests are answered from disk across runs; set CACHE_DISABLE=1 for real evaluation
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+
+# Greedy decoding with a fixed seed, so a cached answer is the one a rerun would produce
+SAMPLING = {"temperature": 0, "seed": 42}
+
+def as_completion(content):
+    # The agent only reads choices[0].message.content
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+async def stream_completion(**kwargs):
+    # Nothing the model writes after a closed </tool_call> is used before the observation
+    # comes back, so stop reading there; closing the stream also ends generation server-side
+    stream = await get_client().chat.completions.create(
+        extra_body={"prompt_cache_key": "react_v1"}, stream=True, **kwargs
+    )
+    parts = []
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                # The closing tag can span chunks, but the chunk that completes it holds ">"
+                if ">" in delta and "</tool_call>" in "".join(parts):
+                    break
+    finally:
+        await stream.close()
+    return "".join(parts)
+
+async def llm(**kwargs):
+    # The system prompt is identical on every iteration, so a stable cache key lets
+    # OpenAI serve that prefix from its prompt cache after the first call. That only
+    # holds while the static prompt (tools included) stays first and every observation
+    # is appended after it.
+    kwargs = {**SAMPLING, **kwargs}
+    messages = kwargs["messages"]
+    assert messages[0]["role"] == "system" and messages[0]["content"].startswith(build_system_prompt())
+    if os.getenv("CACHE_DISABLE") == "1":
+        return as_completion(await stream_completion(**kwargs))
+
+    key = hashlib.blake2b(json.dumps(kwargs, sort_keys=True).encode(), digest_size=16).hexdigest()
+    with shelve.open(CACHE_PATH) as cache:
+        content = cache.get(key)
+    if content is None:
+        content = await stream_completion(**kwargs)
+        with shelve.open(CACHE_PATH) as cache:
+            cache[key] = content
+    return as_completion(content)
+
+if __name__ == "__main__":
+    # Load .env before anything reads DEBUG, CACHE_DISABLE or the API key
+    load_dotenv()
+
+    # Create the agent
+    agent = ReActAgent(
+        llm=llm,
+        system_prompt=build_system_prompt(),
+        tools=tools
+    )
+
+    # Run the agent on independent prompts concurrently
+    results = asyncio.run(agent.run_batch_async([
+        """The sum of 10 and 20 is the width of a rectangle that 
+                       is 100 units long. What is the area of the rectangle?""",
+        "What is the area of a rectangle that is 12.5 units long and 4 units wide?",
+    ]))
+    for result in results:
+        print(result)
@@ -1,6 +1,9 @@
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import asyncio
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
 
 from python_classes.reflection_agent import ReflectionAgent
@@ -23,6 +26,8 @@ reflection_prompts = [
     }
 ]
 
-agent = ReflectionAgent(generator_prompts, reflection_prompts, num_steps=4)
-agent.run(
-    user_prompt="Write me code to visualize this data in a pie chart. Here is the data: {'data': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 'column': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']}")
+if __name__ == "__main__":
+    # ReflectionAgent loads .env and builds its client itself, so nothing runs on import
+    agent = ReflectionAgent(generator_prompts, reflection_prompts, num_steps=4)
+    asyncio.run(agent.run(
+        user_prompt="Write me code to visualize this data in a pie chart. Here is the data: {'data': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 'column': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']}"))
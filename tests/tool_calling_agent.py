@@ -1,22 +1,26 @@
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
 from python_classes.tool_calling_agent import ToolCallingAgent, tool
+from python_classes.prompts import TOOL_CALL_FORMAT, TOOL_CALL_EXAMPLE
 from openai import OpenAI
 from dotenv import load_dotenv
+from functools import lru_cache, partial
 
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+@lru_cache(maxsize=1)
+def get_client():
+    # Built on first use, so importing this module reads no .env and opens no TLS context
+    load_dotenv()
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 @tool
 def calculate_area_of_rectangle(length: float, width: float) -> float:
     """Calculate the area of a rectangle."""
     return length * width
 
-print(calculate_area_of_rectangle.specification)
-
 
 # System prompt for the LLM based on the function_calling_prompt for the add_two_numbers function
 system_prompt = """You are an AI assistant with function calling capabilities. Your primary role is to interpret user requests and call appropriate functions when needed.
@@ -27,35 +31,31 @@ When presented with function definitions within <tools></tools> XML tags, you sh
 2. Carefully inspect the function signature, paying close attention to parameter types and requirements
 3. When calling a function, format your response using the following structure:
 
-<tool_call>
-{
-    "name": "add_two_numbers",
-    "description": "Used to add two numbers together",
-    "parameters": {
-        "properties": {
-            "a": {
-                "type": "int"
-            },
-            "b": {
-                "type": "int"
-            }
-        }
-    }
-}
-
-Expected output:
-
-<tool_call>
-{"name": "add_two_numbers", "arguments": {"a": 1, "b": 2}}
-</tool_call>
-"""
+""" + TOOL_CALL_FORMAT + """
 
+""" + TOOL_CALL_EXAMPLE + """
+"""
 
-agent = ToolCallingAgent(
-    llm=client.chat.completions.create, 
-    system_prompt=system_prompt, 
-    tools=[calculate_area_of_rectangle]
-)
 
-response = agent.run("What is the area of a rectangle with a length of 10 and a width of 20?")
-print(response)
\ No newline at end of file
+if __name__ == "__main__":
+    # Load .env before anything reads DEBUG_TOOLS or the API key
+    load_dotenv()
+
+    if os.getenv("DEBUG_TOOLS"):
+        print(calculate_area_of_rectangle.specification)
+
+    # Both calls of a run share the system prompt, so route them to the same prompt cache entry;
+    # greedy decoding with a fixed seed keeps reruns reproducible
+    agent = ToolCallingAgent(
+        llm=partial(
+            get_client().chat.completions.create,
+            temperature=0,
+            seed=42,
+            extra_body={"prompt_cache_key": "tool_calling_v1"},
+        ), 
+        system_prompt=system_prompt, 
+        tools=[calculate_area_of_rectangle]
+    )
+
+    response = agent.run("What is the area of a rectangle with a length of 10 and a width of 20?")
+    print(response)
\ No newline at end of file